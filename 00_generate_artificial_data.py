@@ -20,7 +20,7 @@ experimental variations. The perturbed sequences are stored in a directory named
      The original sequence is saved as `000.txt`, and perturbed sequences follow the format `001.txt`, `002.txt`, etc.
 
 ### Approach
-- The script uses Python's `random` module to generate and modify DNA sequences.
+- The script uses NumPy's random generator to draw and modify whole sequences at once.
 - Perturbations are applied at the nucleotide level, either removing or substituting letters based on a probability.
 - Outputs are neatly organized in a folder for further analysis or experimentation.
 
@@ -35,24 +35,37 @@ with a 5% mutation probability, and save all sequences in the `SYNTHETIC_DATA` f
 """
 
 import os
-import random
-
-def generate_dna_sequence(length):
-    """Generate a random DNA sequence of given length."""
-    return ''.join(random.choice("ACTG") for _ in range(length))
-
-def perturb_sequence(sequence, probability):
-    """Perturb a DNA sequence by changing or removing letters with a given probability."""
-    perturbed = []
-    for char in sequence:
-        if random.random() < probability:
-            if random.random() < 0.25:  # 50% chance to delete
-                continue
-            else:  # 50% chance to replace
-                perturbed.append(random.choice("ACTG".replace(char, "")))
-        else:
-            perturbed.append(char)
-    return ''.join(perturbed)
+import numpy as np
+
+# Shared random generator and nucleotide lookup table
+RNG = np.random.default_rng()
+_NUCLEOTIDES = np.frombuffer(b"ACTG", dtype=np.uint8)
+
+# Nucleotide code per ASCII byte (A=0, C=1, G=2, T=3, 255 otherwise) and the four equally likely
+# outcomes of perturbing each code: deletion (255) or one of the three other bases
+_BASE_CODES = np.full(256, 255, dtype=np.uint8)
+_BASE_CODES[np.frombuffer(b"ACGT", dtype=np.uint8)] = [0, 1, 2, 3]
+_DELETED = 255
+_OUTCOMES = np.frombuffer(b"\xffCGT" b"\xffAGT" b"\xffACT" b"\xffACG", dtype=np.uint8).reshape(4, 4)
+
+def generate_dna_sequence(length, rng=RNG):
+    """Generate a random DNA sequence of given length (as ASCII bytes)."""
+    return _NUCLEOTIDES[rng.integers(0, 4, size=length, dtype=np.uint8)].tobytes()
+
+def perturb_sequence(sequence, probability, rng=RNG):
+    """Perturb a DNA sequence (ASCII bytes) by changing or removing letters with a given probability.
+    Bytes other than A, C, G and T (e.g. N or a newline) are left unchanged."""
+    bases = np.frombuffer(sequence, dtype=np.uint8)
+    codes = _BASE_CODES[bases]
+    draws = rng.random(len(bases))
+    perturbed_mask = (draws < probability) & (codes <= 3)
+
+    # The draw of a perturbed letter, rescaled to [0, 4), also selects its outcome:
+    # 0 deletes it (25% of perturbations), 1-3 replace it (75%)
+    outcomes = np.minimum((draws[perturbed_mask] / probability * 4).astype(np.uint8), 3)
+    perturbed = bases.copy()
+    perturbed[perturbed_mask] = _OUTCOMES[codes[perturbed_mask], outcomes]
+    return perturbed[~perturbed_mask | (perturbed != _DELETED)].tobytes()
 
 def save_sequences(folder, base_sequence, num_perturbations, perturb_prob):
     """Save the original and perturbed sequences in a specified folder."""
@@ -60,14 +73,14 @@ def save_sequences(folder, base_sequence, num_perturbations, perturb_prob):
         os.makedirs(folder)
 
     # Save the original sequence
-    with open(os.path.join(folder, "000.txt"), "w") as f:
+    with open(os.path.join(folder, "000.txt"), "wb") as f:
         f.write(base_sequence)
 
     # Save perturbed sequences
     for i in range(1, num_perturbations + 1):
         perturbed_sequence = perturb_sequence(base_sequence, perturb_prob)
         filename = f"{i:03}.txt"
-        with open(os.path.join(folder, filename), "w") as f:
+        with open(os.path.join(folder, filename), "wb") as f:
             f.write(perturbed_sequence)
 
 if __name__ == "__main__":
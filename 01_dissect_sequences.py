@@ -15,12 +15,15 @@ start-stop triad patterns, and outputs the results as JSON files in a designated
    - Each identified sub-sequence is recorded with its start position and the extracted sequence in a JSON file.
 
 3. **Batch Processing**:
-   - Processes all `.txt` sequence files in the input folder, ensuring scalability for large datasets.
+   - Processes all `.txt` sequence files in the input folder in parallel worker processes, ensuring scalability for large datasets.
 
 ### Approach
 - Iterates through sequences in steps of three (triads) to mimic codon-based reading in genetics.
 - Starts recording a sub-sequence upon encountering a start triad and stops when a stop triad is found.
 - Stores results as a structured JSON file for easy access and downstream analysis.
+- Uses a Numba-compiled scanner over two-bit nucleotide codes when Numba is installed.
+- Triads made of A, C, G and T are matched via 64-bit masks of triad codes; any other triads
+  (e.g. lowercase or containing N) are matched with a slower set-based scan.
 
 ### Parameters
 - `folder`: Path to the folder containing `.txt` sequence files.
@@ -35,54 +38,279 @@ and `TGA`, `TAG`, `TAA` as stop triads. The results will be saved as JSON files
 
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 
-def analyze_sequences(folder, start_triads, stop_triads, output_folder):
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba is optional, fall back to the pure Python scanner
+    np = None
+    njit = None
+
+# Two-bit code per ASCII byte (A=0, C=1, G=2, T=3), 255 for anything else
+_BASE_CODES = bytearray(b"\xff" * 256)
+for _code, _base in enumerate(b"ACGT"):
+    _BASE_CODES[_base] = _code
+_BASE_CODES = bytes(_BASE_CODES)
+
+def encode_triad(triad):
     """
-    Analyze sequences in the given folder, finding start-stop sub-sequences.
+    Pack a triad into a 6-bit integer code (0-63).
 
     Parameters:
-        folder (str): Path to the folder containing sequences.
-        start_triads (list): List of start triads to look for.
-        stop_triads (list): List of stop triads to look for.
-        output_folder (str): Folder to save the resulting dictionaries.
+        triad (str): Three-letter triad made of A, C, G and T.
+
+    Returns:
+        int: Triad code.
     """
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    if len(triad) != 3 or any(_BASE_CODES[ord(letter)] > 3 for letter in triad):
+        raise ValueError(f"Invalid triad: {triad!r}")
+    a, b, c = (_BASE_CODES[ord(letter)] for letter in triad)
+    return (a << 4) | (b << 2) | c
 
-    sequence_files = [f for f in os.listdir(folder) if f.endswith(".txt")]
-    for seq_file in sequence_files:
-        with open(os.path.join(folder, seq_file), "r") as file:
-            sequence = file.read().strip()
+def can_encode_triads(triads):
+    """
+    Check whether all triads can be packed by encode_triad.
 
-        recordings = []
-        is_recording = False
-        current_recording = ""
-        start_position = None
+    Parameters:
+        triads (list): List of triads.
+
+    Returns:
+        bool: True if every triad consists of three of the letters A, C, G and T.
+    """
+    return all(len(triad) == 3 and all(letter in "ACGT" for letter in triad) for triad in triads)
 
-        for i in range(0, len(sequence), 3):
-            triad = sequence[i:i+3]
+def triad_mask(triads):
+    """
+    Build a 64-bit mask with the bit of every triad code set.
 
-            if len(triad) < 3:  # Skip incomplete triads
+    Parameters:
+        triads (list): List of triads.
+
+    Returns:
+        int: Triad mask.
+    """
+    mask = 0
+    for triad in triads:
+        mask |= 1 << encode_triad(triad)
+    return mask
+
+if njit is not None:
+    @njit("int64(uint8[::1], uint64, uint64, int32[::1], int32[::1])",
+          cache=True, fastmath=True, boundscheck=False)
+    def scan_triads(codes, start_mask, stop_mask, starts, ends):
+        """
+        Scan an encoded sequence triad by triad for start-stop sub-sequences.
+
+        Parameters:
+            codes (np.ndarray): Two-bit nucleotide codes (uint8), one per letter.
+            start_mask (np.uint64): Mask of start triad codes.
+            stop_mask (np.uint64): Mask of stop triad codes.
+            starts (np.ndarray): Output for the start positions (int32, len(codes) // 3 entries).
+            ends (np.ndarray): Output for the end positions (int32, len(codes) // 3 entries).
+
+        Returns:
+            int: Number of sub-sequences found.
+        """
+        n = len(codes) - len(codes) % 3  # Skip incomplete triads
+        count = 0
+        is_recording = False
+        start_position = 0
+        one = np.uint64(1)
+
+        for i in range(0, n, 3):
+            a, b, c = codes[i], codes[i + 1], codes[i + 2]
+            if a > 3 or b > 3 or c > 3:  # Not a valid triad, cannot start or stop
                 continue
+            triad = np.uint64((a << 4) | (b << 2) | c)
 
             if is_recording:
-                current_recording += triad
-                if triad in stop_triads:
+                if (stop_mask >> triad) & one:
                     is_recording = False
-                    recordings.append({
-                        "start_position": start_position,
-                        "sequence": current_recording
-                    })
-                    current_recording = ""
-                    start_position = None
-            elif triad in start_triads:
+                    starts[count] = start_position
+                    ends[count] = i + 3
+                    count += 1
+            elif (start_mask >> triad) & one:
                 is_recording = True
                 start_position = i
-                current_recording += triad
 
-        output_file = os.path.join(output_folder, f"{seq_file.split('.')[0]}_analysis.json")
-        with open(output_file, "w") as out_file:
-            json.dump(recordings, out_file, indent=4)
+        return count
+
+def find_recordings(sequence, start_triads, stop_triads):
+    """
+    Find start-stop sub-sequences in a sequence with a pure Python scan.
+
+    Parameters:
+        sequence (bytes): DNA sequence.
+        start_triads (list): List of start triads to look for.
+        stop_triads (list): List of stop triads to look for.
+
+    Returns:
+        list: Recordings with their start position and sequence (bytes).
+    """
+    if not (can_encode_triads(start_triads) and can_encode_triads(stop_triads)):
+        return find_recordings_by_set(sequence, start_triads, stop_triads)
+
+    start_mask = triad_mask(start_triads)
+    stop_mask = triad_mask(stop_triads)
+
+    recordings = []
+    is_recording = False
+    start_position = None
+
+    # Any letter other than A, C, G, T encodes as 255, which pushes the triad code
+    # past bit 63 of the masks, so such triads never start or stop a recording
+    codes = sequence.translate(_BASE_CODES)
+    for i in range(0, len(codes) - 2, 3):  # Skip incomplete triads
+        triad = (codes[i] << 4) | (codes[i+1] << 2) | codes[i+2]
+
+        if is_recording:
+            if (stop_mask >> triad) & 1:
+                is_recording = False
+                # The recorded triads are contiguous, copy them once at the stop triad
+                recordings.append({
+                    "start_position": start_position,
+                    "sequence": sequence[start_position:i+3]
+                })
+                start_position = None
+        elif (start_mask >> triad) & 1:
+            is_recording = True
+            start_position = i
+
+    return recordings
+
+def find_recordings_by_set(sequence, start_triads, stop_triads):
+    """
+    Find start-stop sub-sequences by comparing every triad against sets of triads. Slower than
+    the mask scan, but supports triads that cannot be encoded (e.g. lowercase or containing N).
+
+    Parameters:
+        sequence (bytes): DNA sequence.
+        start_triads (list): List of start triads to look for.
+        stop_triads (list): List of stop triads to look for.
+
+    Returns:
+        list: Recordings with their start position and sequence (bytes).
+    """
+    start_set = {triad.encode("utf-8") for triad in start_triads}
+    stop_set = {triad.encode("utf-8") for triad in stop_triads}
+
+    recordings = []
+    is_recording = False
+    start_position = None
+
+    for i in range(0, len(sequence) - 2, 3):  # Skip incomplete triads
+        triad = sequence[i:i+3]
+
+        if is_recording:
+            if triad in stop_set:
+                is_recording = False
+                recordings.append({
+                    "start_position": start_position,
+                    "sequence": sequence[start_position:i+3]
+                })
+                start_position = None
+        elif triad in start_set:
+            is_recording = True
+            start_position = i
+
+    return recordings
+
+def analyze_file(path, start_triads, stop_triads):
+    """
+    Find the start-stop sub-sequences of a single sequence file.
+
+    Parameters:
+        path (str): Path to the sequence file.
+        start_triads (frozenset): Start triads to look for.
+        stop_triads (frozenset): Stop triads to look for.
+
+    Returns:
+        bytes: Recordings serialized as JSON.
+    """
+    with open(path, "rb") as file:
+        sequence = file.read().strip()
+
+    if njit is not None and can_encode_triads(start_triads) and can_encode_triads(stop_triads):
+        # Writable, contiguous buffers as required by the compiled signature
+        codes = np.frombuffer(bytearray(sequence).translate(_BASE_CODES), dtype=np.uint8)
+        starts = np.empty(len(codes) // 3, dtype=np.int32)
+        ends = np.empty(len(codes) // 3, dtype=np.int32)
+        count = scan_triads(codes, np.uint64(triad_mask(start_triads)), np.uint64(triad_mask(stop_triads)), starts, ends)
+        recordings = [
+            {"start_position": int(start), "sequence": sequence[start:end]}
+            for start, end in zip(starts[:count].tolist(), ends[:count].tolist())
+        ]
+    else:
+        recordings = find_recordings(sequence, start_triads, stop_triads)
+
+    return serialize_recordings(recordings)
+
+def serialize_recordings(recordings):
+    """
+    Serialize recordings as JSON, decoding their sequences to text only at this point.
+
+    Parameters:
+        recordings (list): Recordings with their start position and sequence (bytes).
+
+    Returns:
+        bytes: JSON document.
+    """
+    readable = [
+        {"start_position": rec["start_position"], "sequence": rec["sequence"].decode("ascii")}
+        for rec in recordings
+    ]
+    return dumps_json(readable)
+
+def dumps_json(data):
+    """Serialize data as indented JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def write_bytes(path, data):
+    """Write a serialized result to disk in a single call."""
+    with open(path, "wb") as file:
+        file.write(data)
+
+def analyze_sequences(folder, start_triads, stop_triads, output_folder, max_workers=None):
+    """
+    Analyze sequences in the given folder, finding start-stop sub-sequences.
+
+    Parameters:
+        folder (str): Path to the folder containing sequences.
+        start_triads (list): List of start triads to look for. Triads other than three of the
+            letters A, C, G and T fall back to a slower set-based scan.
+        stop_triads (list): List of stop triads to look for (same restriction as start_triads).
+        output_folder (str): Folder to save the resulting dictionaries.
+        max_workers (int): Number of worker processes (defaults to the number of CPUs).
+    """
+    # Deduplicated triad sets, turned into lookup keys by the scanners
+    start_triads = frozenset(start_triads)
+    stop_triads = frozenset(stop_triads)
+
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    sequence_files = [f for f in os.listdir(folder) if f.endswith(".txt")]
+    paths = [os.path.join(folder, seq_file) for seq_file in sequence_files]
+
+    # Files are scanned in parallel, results are written by background threads
+    with ProcessPoolExecutor(max_workers=max_workers) as workers, ThreadPoolExecutor(max_workers=2) as io_pool:
+        writes = []
+        results = workers.map(analyze_file, paths, repeat(start_triads), repeat(stop_triads))
+        for seq_file, result in zip(sequence_files, results):
+            output_file = os.path.join(output_folder, f"{seq_file.split('.')[0]}_analysis.json")
+            writes.append(io_pool.submit(write_bytes, output_file, result))
+
+        for write in writes:
+            write.result()  # Re-raise any I/O error
 
 if __name__ == "__main__":
     # Define start and stop triads
@@ -20,8 +20,8 @@ and generates a detailed report in both human-readable and JSON formats.
    - Saves cluster details, including the number of entries and the sequences in each cluster, as a text report and a JSON file.
 
 ### Approach
-- Each sequence is compared to others to calculate pairwise distances.
-- Sequences are grouped into clusters if their distance is below a threshold.
+- Sequences are packed into 2-bit nucleotide codes (4 or 8 bits per letter if they contain letters other than A, C, G and T) and compared block-wise (with Numba if installed) to calculate pairwise distances.
+- Sequences are grouped into clusters if their distance is below a threshold, as connected components of the resulting graph.
 - Results are saved for further downstream analysis or visualization.
 
 ### Parameters
@@ -37,9 +37,42 @@ Results will be saved in the `CLUSTERED_DATA` folder as `clusters.txt` and `clus
 """
 import os
 import json
-from itertools import combinations
 from collections import defaultdict
 import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional, fall back to the NumPy distance kernel
+    njit = None
+
+# Upper bound (in bytes) for the XOR buffer of one tile of pairs, sized to stay in L2
+TILE_BYTES = 1024 * 1024
+
+# Two-bit code per ASCII byte (A=00, C=01, G=10, T=11), 255 for anything else
+_BASE_CODES = np.full(256, 255, dtype=np.uint8)
+_BASE_CODES[np.frombuffer(b"ACGT", dtype=np.uint8)] = [0, 1, 2, 3]
+
+# Packed layout: 64 // bits letters per uint64 word, letter k at bits [bits * k, bits * (k + 1)).
+# A, C, G and T take 2 bits, recordings with other letters fall back to 4 or 8 bits per letter.
+LETTER_BITS = (2, 4, 8)
+
+# _VALID_BITS[bits][k] keeps the low bit of the first k letters in a word
+_VALID_BITS = {
+    bits: np.array(
+        [sum(1 << (bits * i) for i in range(k)) for k in range(64 // bits + 1)],
+        dtype=np.uint64
+    ) for bits in LETTER_BITS
+}
+_POPCOUNT_LUT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
 
 def calculate_distance(seq1, seq2, pos1, pos2, letter_weight=2, position_weight=1):
     """
@@ -47,8 +80,8 @@ def calculate_distance(seq1, seq2, pos1, pos2, letter_weight=2, position_weight=
     and their respective positions.
 
     Parameters:
-        seq1 (str): First sequence.
-        seq2 (str): Second sequence.
+        seq1 (bytes): First sequence.
+        seq2 (bytes): Second sequence.
         pos1 (int): Starting position of the first sequence.
         pos2 (int): Starting position of the second sequence.
         letter_weight (int): Weight for letter differences.
@@ -61,67 +94,405 @@ def calculate_distance(seq1, seq2, pos1, pos2, letter_weight=2, position_weight=
     position_diff = abs(pos1 - pos2)
     return letter_weight * letter_diff + position_weight * position_diff
 
-def cluster_sequences(recordings, distance_threshold, letter_weight=2, position_weight=1):
+def letter_codes(recordings):
     """
-    Cluster sequences based on their distances.
+    Choose the letter codes to pack the sequences of the recordings with: 2-bit nucleotide codes
+    if they only consist of A, C, G and T, otherwise the narrowest of 2, 4 or 8 bits per letter
+    that tells apart all letters occurring in them.
 
     Parameters:
-        recordings (list): List of dictionaries with sequence data.
-        distance_threshold (int): Threshold for clustering.
+        recordings (list): List of dictionaries with sequence data (sequences as bytes).
+
+    Returns:
+        tuple: Code per ASCII byte (uint8, 255 for absent letters) and bits per letter.
+    """
+    counts = np.bincount(np.frombuffer(b"".join(rec['sequence'] for rec in recordings), dtype=np.uint8),
+                         minlength=256)
+    letters = np.flatnonzero(counts)
+    if (_BASE_CODES[letters] <= 3).all():
+        return _BASE_CODES, 2
+    bits = next(bits for bits in LETTER_BITS if len(letters) <= 1 << bits)
+    codes = np.full(256, 255, dtype=np.uint8)
+    codes[letters] = np.arange(len(letters))
+    return codes, bits
+
+def pack_letters(sequence, num_words=None, codes=_BASE_CODES, bits=2):
+    """
+    Pack a sequence into fixed-width letter codes, 64 // bits letters per uint64 word.
+
+    Parameters:
+        sequence (bytes): Sequence to pack.
+        num_words (int): Number of words to pack into, zero padded (defaults to the minimum).
+        codes (np.ndarray): Code per ASCII byte, e.g. from `letter_codes` (2-bit nucleotide codes by default).
+        bits (int): Bits per letter (2, 4 or 8).
+
+    Returns:
+        np.ndarray: Packed sequence (uint64).
+    """
+    letters_per_word = 64 // bits
+    sequence_codes = codes[np.frombuffer(sequence, dtype=np.uint8)]
+    if (sequence_codes >= 1 << bits).any():
+        raise ValueError(f"Sequence contains letters without a {bits}-bit code.")
+    if num_words is None:
+        num_words = -(-len(sequence_codes) // letters_per_word)
+    padded = np.zeros(num_words * letters_per_word, dtype=np.uint64)
+    padded[:len(sequence_codes)] = sequence_codes
+    shifts = np.arange(letters_per_word, dtype=np.uint64) * np.uint64(bits)
+    return np.bitwise_or.reduce(padded.reshape(num_words, letters_per_word) << shifts, axis=1)
+
+def encode_recordings(recordings):
+    """
+    Encode recordings as a matrix of packed sequences alongside their lengths and positions.
+
+    Parameters:
+        recordings (list): List of dictionaries with sequence data (sequences as bytes).
+
+    Returns:
+        tuple: Packed sequences (N x words, uint64), lengths and start positions (int64),
+            and the bits per letter they were packed with.
+    """
+    codes, bits = letter_codes(recordings)
+    lengths = np.array([len(rec['sequence']) for rec in recordings], dtype=np.int64)
+    positions = np.array([rec['start_position'] for rec in recordings], dtype=np.int64)
+    num_words = -(-lengths.max(initial=0) // (64 // bits))
+    packed = np.zeros((len(recordings), num_words), dtype=np.uint64)
+    for i, rec in enumerate(recordings):
+        packed[i] = pack_letters(rec['sequence'], num_words, codes, bits)
+    return packed, lengths, positions, bits
+
+def _fold_letters(x, bits):
+    """OR the bits of every letter of XORed words into its lowest bit (higher bits are left as garbage)."""
+    x = x | (x >> np.uint64(1))
+    if bits > 2:
+        x = x | (x >> np.uint64(2))
+    if bits > 4:
+        x = x | (x >> np.uint64(4))
+    return x
+
+def _popcount(words):
+    """Count the set bits of every uint64 in an array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    return _POPCOUNT_LUT[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1)
+
+if njit is not None:
+    @njit("uint64(uint64)", cache=True, fastmath=True, boundscheck=False)
+    def _popcount64(x):
+        """Count the set bits of a uint64."""
+        x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+    _fold_letters64 = njit("uint64(uint64, int64)", cache=True, fastmath=True, boundscheck=False)(_fold_letters)
+
+    @njit("int64(uint64[::1], uint64[::1], int64, int64, uint64[::1])", cache=True, fastmath=True, boundscheck=False)
+    def hamming_packed(packed_a, packed_b, length_a, length_b, valid_bits):
+        """
+        Count the letter differences between two packed sequences, including their length difference.
+
+        Parameters:
+            packed_a (np.ndarray): First packed sequence.
+            packed_b (np.ndarray): Second packed sequence.
+            length_a (int): Length of the first sequence.
+            length_b (int): Length of the second sequence.
+            valid_bits (np.ndarray): `_VALID_BITS` table of the bits per letter the sequences were packed with.
+
+        Returns:
+            int: Letter differences.
+        """
+        shared = min(length_a, length_b)
+        letters_per_word = len(valid_bits) - 1
+        low_bits = valid_bits[letters_per_word]
+        mismatches = 0
+        if letters_per_word == 32:  # Nucleotides, with constant word arithmetic and a single fold
+            full_words, rest = shared >> 5, shared & 31
+            for w in range(full_words):
+                x = packed_a[w] ^ packed_b[w]
+                mismatches += _popcount64((x | (x >> np.uint64(1))) & low_bits)
+            if rest:
+                x = packed_a[full_words] ^ packed_b[full_words]
+                mismatches += _popcount64((x | (x >> np.uint64(1))) & valid_bits[rest])
+        else:
+            bits = 64 // letters_per_word
+            full_words, rest = shared // letters_per_word, shared % letters_per_word
+            for w in range(full_words):
+                mismatches += _popcount64(_fold_letters64(packed_a[w] ^ packed_b[w], bits) & low_bits)
+            if rest:
+                x = _fold_letters64(packed_a[full_words] ^ packed_b[full_words], bits)
+                mismatches += _popcount64(x & valid_bits[rest])
+        return mismatches + abs(length_a - length_b)
+
+    @njit("int64[:, ::1](uint64[:, ::1], int64[::1], int64[::1], uint64[:, ::1], int64[::1], int64[::1], int64, int64, "
+          "uint64[::1])", parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _packed_block_distances(packed_a, lengths_a, positions_a, packed_b, lengths_b, positions_b,
+                                letter_weight, position_weight, valid_bits):
+        """Numba kernel behind `pairwise_distances`, parallel over the rows of the first block."""
+        distances = np.empty((len(packed_a), len(packed_b)), dtype=np.int64)
+        for i in prange(len(packed_a)):
+            for j in range(len(packed_b)):
+                letter_diff = hamming_packed(packed_a[i], packed_b[j], lengths_a[i], lengths_b[j], valid_bits)
+                position_diff = abs(positions_a[i] - positions_b[j])
+                distances[i, j] = letter_weight * letter_diff + position_weight * position_diff
+        return distances
+
+    @njit("int64(uint64[:, ::1], int64[::1], int64[::1], int64, int64, int64, int64, float64, uint64[::1])",
+          cache=True, fastmath=True, boundscheck=False)
+    def _pair_distance(packed, lengths, positions, i, j, letter_weight, position_weight, distance_threshold,
+                       valid_bits):
+        """Distance between sequences i and j, or -1 if the length difference alone exceeds the threshold."""
+        lower_bound = letter_weight * abs(lengths[i] - lengths[j]) + position_weight * abs(positions[i] - positions[j])
+        if lower_bound > distance_threshold:
+            return -1
+        letter_diff = hamming_packed(packed[i], packed[j], lengths[i], lengths[j], valid_bits)
+        return letter_weight * letter_diff + position_weight * abs(positions[i] - positions[j])
+
+    @njit("void(uint64[:, ::1], int64[::1], int64[::1], int64, int64, float64, uint64[::1], int64[::1])",
+          parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _count_pairs(packed, lengths, positions, letter_weight, position_weight, distance_threshold, valid_bits,
+                     counts):
+        """First pass of `threshold_pairs`: count the pairs (i, j > i) within the threshold per row."""
+        n = len(packed)
+        for i in prange(n):
+            count = 0
+            for j in range(i + 1, n):
+                # Positions are sorted, so no later j can be within the threshold either
+                if position_weight * (positions[j] - positions[i]) > distance_threshold:
+                    break
+                distance = _pair_distance(packed, lengths, positions, i, j, letter_weight, position_weight,
+                                          distance_threshold, valid_bits)
+                if 0 <= distance <= distance_threshold:
+                    count += 1
+            counts[i] = count
+
+    @njit("void(uint64[:, ::1], int64[::1], int64[::1], int64, int64, float64, uint64[::1], int64[::1], int64[::1], "
+          "int64[::1])", parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _fill_pairs(packed, lengths, positions, letter_weight, position_weight, distance_threshold, valid_bits,
+                    offsets, rows, cols):
+        """Second pass of `threshold_pairs`: write the pairs of row i from offsets[i] on."""
+        n = len(packed)
+        for i in prange(n):
+            k = offsets[i]
+            for j in range(i + 1, n):
+                if position_weight * (positions[j] - positions[i]) > distance_threshold:
+                    break
+                distance = _pair_distance(packed, lengths, positions, i, j, letter_weight, position_weight,
+                                          distance_threshold, valid_bits)
+                if 0 <= distance <= distance_threshold:
+                    rows[k] = i
+                    cols[k] = j
+                    k += 1
+
+def pairwise_distances(packed_a, lengths_a, positions_a, packed_b, lengths_b, positions_b,
+                       letter_weight=2, position_weight=1, bits=2):
+    """
+    Calculate the distances between all sequences of two blocks of packed sequences.
+
+    Matches `calculate_distance`: letters are compared over the shorter sequence, and
+    the length difference is added to the letter differences.
+
+    Parameters:
+        packed_a (np.ndarray): First block of packed sequences.
+        lengths_a (np.ndarray): Sequence lengths of the first block.
+        positions_a (np.ndarray): Starting positions of the first block.
+        packed_b (np.ndarray): Second block of packed sequences.
+        lengths_b (np.ndarray): Sequence lengths of the second block.
+        positions_b (np.ndarray): Starting positions of the second block.
         letter_weight (int): Weight for letter differences.
         position_weight (int): Weight for positional differences.
+        bits (int): Bits per letter the sequences were packed with.
 
     Returns:
-        dict: Clusters with their entries.
+        np.ndarray: Distance matrix of shape (len(packed_a), len(packed_b)).
     """
-    print("Starting clustering process...")
-    clusters = []
-    unclustered = set(range(len(recordings)))
+    integer_weights = all(isinstance(w, (int, np.integer)) for w in (letter_weight, position_weight))
+    if njit is not None and integer_weights:
+        # The compiled kernel takes contiguous int64/uint64 arrays and integer weights
+        return _packed_block_distances(
+            np.ascontiguousarray(packed_a, dtype=np.uint64),
+            np.ascontiguousarray(lengths_a, dtype=np.int64),
+            np.ascontiguousarray(positions_a, dtype=np.int64),
+            np.ascontiguousarray(packed_b, dtype=np.uint64),
+            np.ascontiguousarray(lengths_b, dtype=np.int64),
+            np.ascontiguousarray(positions_b, dtype=np.int64),
+            letter_weight, position_weight, _VALID_BITS[bits]
+        )
+
+    # A letter differs if any of its bits differs, keep one bit per letter
+    x = _fold_letters(packed_a[:, None, :] ^ packed_b[None, :, :], bits)
+
+    # Only compare the letters both sequences have
+    letters_per_word = 64 // bits
+    shared = np.minimum(lengths_a[:, None], lengths_b[None, :])
+    word_starts = np.arange(packed_a.shape[1]) * letters_per_word
+    valid = np.clip(shared[:, :, None] - word_starts, 0, letters_per_word)
+    mismatches = _popcount(x & _VALID_BITS[bits][valid]).sum(axis=-1, dtype=np.int64)
+
+    letter_diff = mismatches + np.abs(lengths_a[:, None] - lengths_b[None, :])
+    position_diff = np.abs(positions_a[:, None] - positions_b[None, :])
+    return letter_weight * letter_diff + position_weight * position_diff
+
+def _tile_size(packed):
+    """Side length of square tiles of pairs whose XOR buffer fits into TILE_BYTES."""
+    return max(1, int(np.sqrt(TILE_BYTES / max(1, packed.itemsize * packed.shape[1]))))
+
+def distance_sum(packed, lengths, positions, letter_weight=2, position_weight=1, bits=2):
+    """
+    Sum the distances over all ordered pairs of a block of packed sequences, tile by tile.
 
-    total_pairs = len(recordings) * (len(recordings) - 1) // 2
+    Parameters:
+        packed (np.ndarray): Packed sequences.
+        lengths (np.ndarray): Sequence lengths.
+        positions (np.ndarray): Starting positions.
+        letter_weight (int): Weight for letter differences.
+        position_weight (int): Weight for positional differences.
+        bits (int): Bits per letter the sequences were packed with.
+
+    Returns:
+        int: Sum of the distance matrix (twice the sum over unique pairs).
+    """
+    tile_size = _tile_size(packed)
+    total = 0
+    for i0 in range(0, len(packed), tile_size):
+        i1 = i0 + tile_size
+        # The distance matrix is symmetric, count each tile above the diagonal twice
+        for j0 in range(i0, len(packed), tile_size):
+            j1 = j0 + tile_size
+            distances = pairwise_distances(
+                packed[i0:i1], lengths[i0:i1], positions[i0:i1],
+                packed[j0:j1], lengths[j0:j1], positions[j0:j1],
+                letter_weight, position_weight, bits
+            )
+            total += (1 if i0 == j0 else 2) * distances.sum().item()
+    return total
+
+def threshold_pairs(packed, lengths, positions, distance_threshold, letter_weight=2, position_weight=1, bits=2):
+    """
+    Find all pairs of sequences whose distance is within the threshold.
+
+    Parameters:
+        packed (np.ndarray): Packed sequences.
+        lengths (np.ndarray): Sequence lengths.
+        positions (np.ndarray): Starting positions.
+        distance_threshold (int): Threshold for clustering.
+        letter_weight (int): Weight for letter differences.
+        position_weight (int): Weight for positional differences.
+        bits (int): Bits per letter the sequences were packed with.
+
+    Returns:
+        tuple: Row and column indices (i < j) of the pairs within the threshold.
+    """
+    num_recordings = len(packed)
+    total_pairs = num_recordings * (num_recordings - 1) // 2
     print(f"Total pairs to test: {total_pairs}")
 
-    iteration = 1
-    total_checked = 0
-    while unclustered:
-        print(f"Iteration {iteration}: {len(unclustered)} sequences remaining to cluster.")
-        start_time = time.time()
-        current_cluster = []
-        to_check = [unclustered.pop()]  # Start with an unclustered point
-
-        while to_check:
-            idx = to_check.pop()
-            current_cluster.append(idx)
-            to_remove = set()
-
-            for other_idx in unclustered:
-                dist = calculate_distance(
-                    recordings[idx]['sequence'],
-                    recordings[other_idx]['sequence'],
-                    recordings[idx]['start_position'],
-                    recordings[other_idx]['start_position'],
-                    letter_weight,
-                    position_weight
+    # Sorting by position lets each row stop at the first partner too far away
+    order = np.argsort(positions, kind="stable")
+    packed = np.ascontiguousarray(packed[order], dtype=np.uint64)
+    lengths = np.ascontiguousarray(lengths[order], dtype=np.int64)
+    positions = np.ascontiguousarray(positions[order], dtype=np.int64)
+    can_prune = letter_weight >= 0 and position_weight >= 0
+
+    integer_weights = all(isinstance(w, (int, np.integer)) for w in (letter_weight, position_weight))
+    if njit is not None and integer_weights and can_prune:
+        arguments = (packed, lengths, positions, letter_weight, position_weight, float(distance_threshold),
+                     _VALID_BITS[bits])
+        counts = np.empty(num_recordings, dtype=np.int64)
+        _count_pairs(*arguments, counts)
+        offsets = np.zeros(num_recordings, dtype=np.int64)
+        np.cumsum(counts[:-1], out=offsets[1:])
+        rows = np.empty(counts.sum(), dtype=np.int64)
+        cols = np.empty(counts.sum(), dtype=np.int64)
+        _fill_pairs(*arguments, offsets, rows, cols)
+        print(f"Checked {total_pairs}/{total_pairs} pairs... ({100:.2f}%)")
+    else:
+        # Otherwise compare square tiles of the upper triangle, small enough to stay in cache
+        tile_size = _tile_size(packed)
+        rows, cols = [], []
+        total_checked = 0
+        for i0 in range(0, num_recordings, tile_size):
+            i1 = min(i0 + tile_size, num_recordings)
+            for j0 in range(i0, num_recordings, tile_size):
+                j1 = min(j0 + tile_size, num_recordings)
+                # Positions are sorted, so this and all later tiles are too far away
+                if can_prune and position_weight * (positions[j0] - positions[i1 - 1]) > distance_threshold:
+                    break
+                distances = pairwise_distances(
+                    packed[i0:i1], lengths[i0:i1], positions[i0:i1],
+                    packed[j0:j1], lengths[j0:j1], positions[j0:j1],
+                    letter_weight, position_weight, bits
                 )
-                total_checked += 1
-                if total_checked % 100 == 0:
-                    print(f"Checked {total_checked}/{total_pairs} pairs... ({(total_checked / total_pairs) * 100:.2f}%)")
+                tile_rows, tile_cols = np.nonzero(distances <= distance_threshold)
+                tile_rows += i0
+                tile_cols += j0
+                upper = tile_rows < tile_cols  # Each pair once, no self pairs
+                rows.append(tile_rows[upper])
+                cols.append(tile_cols[upper])
 
-                if dist <= distance_threshold:
-                    to_check.append(other_idx)
-                    to_remove.add(other_idx)
+            total_checked += sum(num_recordings - i - 1 for i in range(i0, i1))
+            print(f"Checked {total_checked}/{total_pairs} pairs... ({(total_checked / max(1, total_pairs)) * 100:.2f}%)")
 
-            unclustered -= to_remove
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
 
-        clusters.append(current_cluster)
-        iteration_time = time.time() - start_time
-        print(f"Iteration {iteration} complete. Cluster size: {len(current_cluster)}. Time taken: {iteration_time:.2f}s")
-        iteration += 1
+    # Back to the original recording indices
+    rows, cols = order[rows], order[cols]
+    return np.minimum(rows, cols), np.maximum(rows, cols)
 
-    print("Clustering process complete.")
-    return clusters
+def cluster_sequences(recordings, distance_threshold, letter_weight=2, position_weight=1):
+    """
+    Cluster sequences based on their distances.
+
+    Parameters:
+        recordings (list): List of dictionaries with sequence data.
+        distance_threshold (int): Threshold for clustering.
+        letter_weight (int): Weight for letter differences.
+        position_weight (int): Weight for positional differences.
 
-def analyze_clusters(clusters, recordings, output_file):
+    Returns:
+        tuple: Clusters as lists of indices, and the encoding (packed sequences, lengths,
+            positions and bits per letter) they were compared with (reusable by `analyze_clusters`).
+    """
+    print("Starting clustering process...")
+    packed, lengths, positions, bits = encode_recordings(recordings)
+    num_recordings = len(recordings)
+
+    rows, cols = threshold_pairs(packed, lengths, positions, distance_threshold, letter_weight, position_weight, bits)
+    adjacency = coo_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+        shape=(num_recordings, num_recordings)
+    ).tocsr()
+    print(f"Found {len(rows)} pairs within the distance threshold.")
+
+    # Single-linkage clusters are the connected components of the neighbourhood graph
+    num_clusters, labels = connected_components(adjacency, directed=False)
+    members = np.argsort(labels, kind="stable")
+    boundaries = np.cumsum(np.bincount(labels, minlength=num_clusters))[:-1]
+    # np.split would turn zero recordings into one empty cluster
+    clusters = [cluster.tolist() for cluster in np.split(members, boundaries)] if num_clusters else []
+    print(f"Found {num_clusters} clusters.")
+
+    print("Clustering process complete.")
+    return clusters, (packed, lengths, positions, bits)
+
+def dumps_json(data):
+    """Serialize data as indented JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def loads_json(path):
+    """Load a JSON file, with orjson when it is installed."""
+    with open(path, "rb") as file:
+        data = file.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def write_bytes(path, data):
+    """Write a serialized result to disk in a single call."""
+    with open(path, "wb") as file:
+        file.write(data)
+
+def analyze_clusters(clusters, recordings, output_file, encoded=None, letter_weight=2, position_weight=1):
     """
     Analyze and save clusters in a human-readable format.
 
@@ -129,20 +500,24 @@ def analyze_clusters(clusters, recordings, output_file):
         clusters (list): Clusters with indices.
         recordings (list): List of recording dictionaries.
         output_file (str): Path to save the cluster analysis.
+        encoded (tuple): Encoding from `cluster_sequences` (encoded here if omitted).
+        letter_weight (int): Weight for letter differences.
+        position_weight (int): Weight for positional differences.
     """
     print("Analyzing clusters...")
+    packed, lengths, positions, bits = encoded if encoded is not None else encode_recordings(recordings)
     cluster_data = []
     for i, cluster in enumerate(clusters, start=1):
         print(f"Analyzing Cluster {i} with {len(cluster)} entries...")
         cluster_sequences = [recordings[idx] for idx in cluster]
-        avg_distance = sum(
-            calculate_distance(
-                rec1['sequence'],
-                rec2['sequence'],
-                rec1['start_position'],
-                rec2['start_position']
-            ) for rec1, rec2 in combinations(cluster_sequences, 2)
-        ) / max(1, len(cluster) * (len(cluster) - 1) / 2)
+
+        # Sum over all ordered pairs (the diagonal is zero), i.e. twice the sum over unique pairs
+        avg_distance = 0.0
+        if len(cluster) > 1:
+            members = np.asarray(cluster)
+            total = distance_sum(packed[members], lengths[members], positions[members], letter_weight,
+                                 position_weight, bits)
+            avg_distance = total / (len(cluster) * (len(cluster) - 1))
 
         cluster_data.append({
             "cluster_id": i,
@@ -152,27 +527,32 @@ def analyze_clusters(clusters, recordings, output_file):
                 {
                     "sequence_id": entry['sequence_id'],
                     "start_position": entry['start_position'],
-                    "sequence": entry['sequence']
+                    "sequence": entry['sequence'].decode("ascii")  # Text only in the written results
                 } for entry in cluster_sequences
             ]
         })
 
     cluster_data.sort(key=lambda x: x['num_entries'], reverse=True)
 
-    with open(output_file, "w") as f:
-        for cluster in cluster_data:
-            f.write(f"Cluster {cluster['cluster_id']}\n")
-            f.write(f"Number of Entries: {cluster['num_entries']}\n")
-            f.write(f"Average Distance: {cluster['avg_distance']:.2f}\n")
-            f.write("Entries:\n")
-            for entry in cluster['entries']:
-                f.write(f"  Sequence ID: {entry['sequence_id']}, Start: {entry['start_position']}, Sequence: {entry['sequence']}\n")
-            f.write("\n")
-
-    # Save as JSON
+    report = []
+    for cluster in cluster_data:
+        report.append(f"Cluster {cluster['cluster_id']}\n")
+        report.append(f"Number of Entries: {cluster['num_entries']}\n")
+        report.append(f"Average Distance: {cluster['avg_distance']:.2f}\n")
+        report.append("Entries:\n")
+        for entry in cluster['entries']:
+            report.append(f"  Sequence ID: {entry['sequence_id']}, Start: {entry['start_position']}, Sequence: {entry['sequence']}\n")
+        report.append("\n")
+
+    # Save the report and the JSON side by side, each in a single write
     json_output_file = output_file.replace('.txt', '.json')
-    with open(json_output_file, "w") as json_file:
-        json.dump(cluster_data, json_file, indent=4)
+    with ThreadPoolExecutor(max_workers=2) as io_pool:
+        writes = [
+            io_pool.submit(write_bytes, output_file, "".join(report).encode("utf-8")),
+            io_pool.submit(write_bytes, json_output_file, dumps_json(cluster_data))
+        ]
+        for write in writes:
+            write.result()  # Re-raise any I/O error
 
     print("Analysis complete. Results saved.")
 
@@ -192,19 +572,19 @@ if __name__ == "__main__":
     all_recordings = []
     for file in os.listdir(INPUT_FOLDER):
         if file.endswith(".json"):
-            with open(os.path.join(INPUT_FOLDER, file), "r") as f:
-                for recording in json.load(f):
-                    recording['sequence_id'] = file.split(".")[0]  # Add sequence ID
-                    all_recordings.append(recording)
+            for recording in loads_json(os.path.join(INPUT_FOLDER, file)):
+                recording['sequence'] = recording['sequence'].encode("ascii")  # Bytes from here on
+                recording['sequence_id'] = file.split(".")[0]  # Add sequence ID
+                all_recordings.append(recording)
 
     print(f"Loaded {len(all_recordings)} recordings.")
 
     # Perform clustering
     start_time = time.time()
-    clusters = cluster_sequences(all_recordings, DISTANCE_THRESHOLD, LETTER_WEIGHT, POSITION_WEIGHT)
+    clusters, encoded = cluster_sequences(all_recordings, DISTANCE_THRESHOLD, LETTER_WEIGHT, POSITION_WEIGHT)
     clustering_time = time.time() - start_time
     print(f"Clustering completed in {clustering_time:.2f}s.")
 
     # Save clusters
-    analyze_clusters(clusters, all_recordings, OUTPUT_FILE)
+    analyze_clusters(clusters, all_recordings, OUTPUT_FILE, encoded)
     print("Program finished. Results saved in CLUSTERED_DATA folder.")
@@ -21,8 +21,8 @@ the clusters as color-coded sequence plots.
    - Saves cluster details, including the number of entries and the sequences in each cluster, as a text report and a JSON file.
 
 4. **Visualization**:
-   - Generates plots for the top clusters, with sequences color-coded by their characters.
-   - Saves plots as PNG and EPS files for publication or further analysis.
+   - Generates plots for the top clusters, with sequences color-coded by their characters and drawn as a single image.
+   - Saves plots as PNG files, and optionally as EPS files, for publication or further analysis.
 
 ### Approach
 - Each sequence is compared to others to calculate pairwise distances.
@@ -39,6 +39,7 @@ the clusters as color-coded sequence plots.
 - `OUTPUT_FOLDER`: Directory to save the plots.
 - `NUM_CLUSTERS`: Number of clusters to visualize.
 - `CUSTOM_COLOR_MAP`: Custom mapping of letters to hexadecimal colors for the plots.
+- `SAVE_EPS`: Whether to save EPS files in addition to the PNG plots.
 
 ### Example Usage
 Run the script to cluster sequences stored in `ANALYZED_DATA` with a distance threshold of 21.
@@ -48,11 +49,42 @@ Plots of the top 10 clusters will be saved in the `CLUSTER_PLOTS` folder.
 
 import os
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgb
 import seaborn as sns
 import json
 import numpy as np
 
-def plot_clusters(cluster_file, output_folder, num_clusters=10, color_map=None):
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+# Letters are only drawn into the boxes of plots narrower than this many positions
+MAX_LABELED_WIDTH = 200
+
+# Image rows per sequence; the first and last stay background so boxes are 0.8 high
+ROW_SUBDIVISIONS = 10
+
+def build_palette(color_map):
+    """
+    Build an RGB lookup table indexed by ASCII byte.
+
+    Parameters:
+        color_map (dict): Mapping of letters to hexadecimal colors.
+
+    Returns:
+        np.ndarray: Palette (256 x 3, uint8); byte 0 is the white background,
+            letters missing from the color map are black.
+    """
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette[0] = 255
+    for letter, color in color_map.items():
+        rgb = np.round(np.array(to_rgb(color)) * 255).astype(np.uint8)
+        palette[ord(letter.upper())] = rgb
+        palette[ord(letter.lower())] = rgb
+    return palette
+
+def plot_clusters(cluster_file, output_folder, num_clusters=10, color_map=None, save_eps=False):
     """
     Plot the sequences in clusters as color-coded visualizations.
 
@@ -61,18 +93,22 @@ def plot_clusters(cluster_file, output_folder, num_clusters=10, color_map=None):
         output_folder (str): Directory to save the plots.
         num_clusters (int): Number of clusters to visualize.
         color_map (dict): Custom mapping of letters to hexadecimal colors.
+        save_eps (bool): Also save every plot as EPS next to the PNG.
     """
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    with open(cluster_file, "r") as f:
-        cluster_data = json.load(f)
+    with open(cluster_file, "rb") as f:
+        data = f.read()
+    cluster_data = orjson.loads(data) if orjson is not None else json.loads(data)
 
     # Use default colors if no color map is provided
     if color_map is None:
         default_colors = sns.color_palette("hsv", 26)  # One color per letter
         color_map = {chr(65 + i): f"#{int(c[0]*255):02x}{int(c[1]*255):02x}{int(c[2]*255):02x}" for i, c in enumerate(default_colors)}
 
+    palette = build_palette(color_map)
+
     for cluster in cluster_data[:num_clusters]:
         cluster_id = cluster['cluster_id']
         entries = cluster['entries']
@@ -81,19 +117,30 @@ def plot_clusters(cluster_file, output_folder, num_clusters=10, color_map=None):
 
         # Determine the minimum starting position to adjust the x-axis
         min_start_pos = min(entry['start_position'] for entry in entries)
+        width = max(entry['start_position'] + len(entry['sequence']) - min_start_pos for entry in entries)
 
+        # One row of letter bytes per sequence, zero (background) outside the sequence
+        codes = np.zeros((len(entries), width), dtype=np.uint8)
         for i, entry in enumerate(entries):
-            sequence = entry['sequence']
             start_pos = entry['start_position'] - min_start_pos  # Adjust start position
-            sequence_id = entry['sequence_id']
+            sequence = entry['sequence'].encode("ascii")
+            codes[i, start_pos:start_pos + len(sequence)] = np.frombuffer(sequence, dtype=np.uint8)
 
-            # Create a color bar for the sequence
-            for j, letter in enumerate(sequence):
-                color = color_map.get(letter.upper(), "#000000")  # Default to black if not in color map
-                ax.barh(i, 1, left=start_pos + j, color=color, edgecolor='none', height=0.8)
+        # Draw all colored boxes as a single image, row i centered on y = i
+        codes = np.repeat(codes, ROW_SUBDIVISIONS, axis=0)
+        codes[0::ROW_SUBDIVISIONS] = 0
+        codes[ROW_SUBDIVISIONS - 1::ROW_SUBDIVISIONS] = 0
+        ax.imshow(palette[codes], extent=[0, width, -0.5, len(entries) - 0.5], origin="lower",
+                  aspect="auto", interpolation="none")
+
+        for i, entry in enumerate(entries):
+            start_pos = entry['start_position'] - min_start_pos
+            sequence_id = entry['sequence_id']
 
-                # Add the letter inside the colored box
-                ax.text(start_pos + j + 0.5, i, letter, ha='center', va='center', fontsize=8, color='white')
+            # Add the letters inside the colored boxes while they are still legible
+            if width < MAX_LABELED_WIDTH:
+                for j, letter in enumerate(entry['sequence']):
+                    ax.text(start_pos + j + 0.5, i, letter, ha='center', va='center', fontsize=8, color='white')
 
             # Annotate sequence ID and start position
             ax.text(-5, i, f"{sequence_id} (Start: {entry['start_position']})", ha='right', va='center', fontsize=8)
@@ -102,20 +149,23 @@ def plot_clusters(cluster_file, output_folder, num_clusters=10, color_map=None):
         ax.set_yticks(range(len(entries)))
         ax.set_yticklabels([f"{entry['sequence_id']}" for entry in entries], fontsize=8)
         ax.set_xlabel("Position")
-        ax.set_xlim(0, max(entry['start_position'] + len(entry['sequence']) - min_start_pos for entry in entries) + 10)
+        ax.set_xlim(0, width + 10)
+        ax.set_ylim(-0.5, len(entries) - 0.5)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        # Save the plot
+        # Save the plot, vector formats embed the boxes at one pixel per letter (interpolation="none")
         plot_file_base = os.path.join(output_folder, f"cluster_{cluster_id}")
-        plt.savefig(f"{plot_file_base}.png", format="png", dpi=300)
-        plt.savefig(f"{plot_file_base}.eps", format="eps", dpi=300)
-        plt.close()
+        fig.savefig(f"{plot_file_base}.png", format="png", dpi=300)
+        if save_eps:
+            fig.savefig(f"{plot_file_base}.eps", format="eps", dpi=150)
+        plt.close(fig)
 
 if __name__ == "__main__":
     CLUSTER_FILE = "CLUSTERED_DATA/clusters.json"
     OUTPUT_FOLDER = "CLUSTER_PLOTS"
     NUM_CLUSTERS = 10
+    SAVE_EPS = False  # Set to True to also export EPS files
 
     # Custom color map for letters (optional)
     CUSTOM_COLOR_MAP = {
@@ -126,5 +176,5 @@ if __name__ == "__main__":
         "N": "#999999"  # Example for 'N' or ambiguous bases
     }
 
-    plot_clusters(CLUSTER_FILE, OUTPUT_FOLDER, NUM_CLUSTERS, CUSTOM_COLOR_MAP)
+    plot_clusters(CLUSTER_FILE, OUTPUT_FOLDER, NUM_CLUSTERS, CUSTOM_COLOR_MAP, SAVE_EPS)
     print(f"Plots saved in {OUTPUT_FOLDER}")